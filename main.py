@@ -7,8 +7,11 @@ acentos para compatibilidad con consolas en Windows.
 
 import sys  # acceso a argumentos y control del intérprete
 import os  # operaciones de sistema de archivos
+import gc  # control del recolector de basura durante la carga
 import csv  # lectura de ficheros CSV
 import time  # para medir tiempos de ejecución
+from contextlib import contextmanager  # para definir gc_paused como bloque with
+from operator import attrgetter, itemgetter  # acceso a campos y columnas implementado en C
 from datetime import datetime  # para manejo de fechas
 from models import Record  # clase Record para representar cada fila del CSV
 from structures import LinkedList, Stack, Queue, AVLTree  # estructuras propias del proyecto
@@ -16,6 +19,72 @@ from sorting import merge_sort_linkedlist, quick_sort_linkedlist  # algoritmos d
 
 
 
+# nombres posibles de cada campo en la cabecera del CSV; estos alias nos ayudan a ser
+# flexibles con los nombres de columnas. Se definen una sola vez para todas las cargas.
+_ALIASES = (
+    ('customer_id', ('customer id', 'customer_id', 'id')),  # diferentes formas de nombrar el ID
+    ('first_name', ('first name', 'firstname', 'first_name')),  # diferentes formas del nombre
+    ('last_name', ('last name', 'lastname', 'last_name')),  # diferentes formas del apellido
+    ('company', ('company', 'company name')),  # diferentes formas de la empresa
+    ('city', ('city',)),  # nombre de la ciudad
+    ('country', ('country',)),  # nombre del país
+    ('email', ('email',)),  # correo electrónico
+    ('subscription_date', ('subscription date', 'subscription_date', 'date')),  # fecha de suscripción
+    ('website', ('website', 'web')),  # página web
+)
+
+# orden de los campos en el constructor de Record (el mismo de _ALIASES)
+_FIELD_ORDER = tuple(key for key, _ in _ALIASES)
+
+# opciones de ordenamiento del menú: campo, algoritmo, nombre a mostrar y encabezado del listado
+_SORTS = {
+    '1': ('customer_id', merge_sort_linkedlist, 'Customer ID (merge sort)', 'Customer ID'),
+    '2': ('first_name', merge_sort_linkedlist, 'First Name (merge sort)', 'First Name'),
+    '3': ('subscription_date', quick_sort_linkedlist, 'Subscription Date (quick sort)', 'Subscription Date'),
+    '4': ('country', merge_sort_linkedlist, 'Country (merge sort)', 'pais'),
+}
+
+
+@contextmanager
+def gc_paused():
+    # Pausa el recolector de basura cíclico mientras se construyen estructuras grandes.
+    # Los nodos creados en estas cargas viven hasta el final, así que revisarlos en cada
+    # recolección automática solo hace más lento el proceso.
+    was_enabled = gc.isenabled()  # recordamos cómo estaba el recolector
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:  # restauramos el estado que tenía el recolector
+            gc.enable()
+
+
+def build_tree_index(ll: LinkedList, keyfn, presorted=False):
+    # Construye un AVLTree con todos los registros de la lista usando la clave indicada
+    # presorted: la lista ya viene ordenada por esa clave (se arma en O(n) sin rotaciones)
+    with gc_paused():  # los nodos del índice se conservan, no hace falta recolectar
+        if presorted:
+            return AVLTree.build_from_sorted(ll, keyfn)
+        idx = AVLTree(keyfn=keyfn)  # nuevo árbol índice
+        for rec in ll:
+            idx.insert(rec)  # poblar árbol con los registros
+    return idx
+
+
+# clave del índice por fecha; search_by_date_range la reconoce para usar la consulta por rango
+_DATE_KEY = attrgetter('subscription_date')
+
+
+def build_date_index(ll: LinkedList, presorted=False):
+    # Índice AVLTree por fecha de suscripción. Los registros sin fecha válida (None) quedan
+    # fuera: None no se puede comparar con una fecha y tampoco entra en ningún rango
+    dated = LinkedList()  # solo los registros con fecha
+    for rec in ll:
+        if rec.subscription_date is not None:
+            dated.append(rec)
+    return build_tree_index(dated, _DATE_KEY, presorted=presorted)
+
+
 def load_csv(path, tree_keyfn=None):
     """Carga un CSV y construye las estructuras de datos principales.
 
@@ -31,83 +100,86 @@ def load_csv(path, tree_keyfn=None):
     min_date = None  # guardaremos la fecha de suscripción más antigua que encontremos
     max_date = None  # guardaremos la fecha de suscripción más reciente que encontremos
 
-    # abrimos el archivo CSV para lectura, ignorando caracteres problemáticos
-    with open(path, encoding="utf-8", errors="ignore") as f:
-        reader = csv.reader(f)  # creamos un lector que nos dará una fila a la vez
-        headers = next(reader, None)  # intentamos leer la primera fila como cabeceras
-
-        # construimos un mapa para encontrar las columnas del CSV por su nombre
-        index = {}  # diccionario que nos dirá en qué columna está cada campo
-        if headers:  # si encontramos cabeceras en la primera fila
-            h = [c.strip().lower() for c in headers]  # limpiamos y convertimos a minúsculas
-            aliases = {  # definimos los nombres posibles para cada campo
-                'customer_id': ['customer id', 'customer_id', 'id'],  # diferentes formas de nombrar el ID
-                'first_name': ['first name', 'firstname', 'first_name'],  # diferentes formas del nombre
-                'last_name': ['last name', 'lastname', 'last_name'],  # diferentes formas del apellido
-                'company': ['company', 'company name'],  # diferentes formas de la empresa
-                'city': ['city'],  # nombre de la ciudad
-                'country': ['country'],  # nombre del país
-                'email': ['email'],  # correo electrónico
-                'subscription_date': ['subscription date', 'subscription_date', 'date'],  # fecha de suscripción
-                'website': ['website', 'web'],  # página web
-            }  # estos alias nos ayudan a ser flexibles con los nombres de columnas
-            for key, names in aliases.items():  # por cada campo que necesitamos
-                for nm in names:  # probamos cada nombre posible
-                    if nm in h:  # si encontramos este nombre en las cabeceras
-                        index[key] = h.index(nm)  # guardamos en qué columna está
-                        break  # no necesitamos seguir buscando
-
-        # procesamos cada fila de datos del CSV una por una
-        for row in reader:  # por cada línea que quede en el archivo
-            try:  # intentamos procesar esta fila, si falla la saltamos
-                # función auxiliar para obtener el valor de una columna de forma segura
-                def val(k, default=""):  # k es el nombre del campo, default es qué devolver si no existe
-                    if k in index:  # si sabemos dónde está esta columna
-                        idx = index[k]  # obtenemos el número de columna
-                        if idx < len(row):  # si la fila tiene suficientes columnas
-                            return row[idx]  # devolvemos el valor de esa columna
-                        return default  # si no hay suficientes columnas, devolvemos el valor por defecto
-                    return default  # si no conocemos esta columna, devolvemos el valor por defecto
-
-                # extraemos los valores de cada campo dependiendo de si tenemos cabeceras
-                if headers and index:  # si detectamos cabeceras y tenemos el mapa de columnas
-                    cid = val('customer_id', '')  # obtenemos el ID del cliente
-                    fn = val('first_name', '')  # obtenemos el primer nombre
-                    ln = val('last_name', '')  # obtenemos el apellido
-                    comp = val('company', '')  # obtenemos el nombre de la empresa
-                    city = val('city', '')  # obtenemos la ciudad
-                    country = val('country', '')  # obtenemos el país
-                    email = val('email', '')  # obtenemos el correo electrónico
-                    sub = val('subscription_date', '')
-                    web = val('website', '')
-                else:
-                    # si no hay cabecera, rellenar hasta 9 campos y tomar los primeros
-                    row = row + [''] * 9
-                    cid, fn, ln, comp, city, country, email, sub, web = row[:9]
-
-                # Construir el objeto Record con limpieza de espacios
-                rec = Record(
-                    cid.strip(), fn.strip(), ln.strip(), comp.strip(),
-                    city.strip(), country.strip(), email.strip(),
-                    sub.strip(), web.strip(),
-                )
-            except Exception:
-                # Si la fila no se puede parsear, saltarla
-                continue
+    # durante la carga se crean cientos de miles de nodos que viven hasta el final;
+    # pausamos el recolector cíclico para que no los recorra una y otra vez
+    with gc_paused():
+        # abrimos el archivo CSV para lectura, ignorando caracteres problemáticos y leyendo de a 1 MiB
+        with open(path, encoding="utf-8", errors="ignore", buffering=1 << 20) as f:
+            reader = csv.reader(f)  # creamos un lector que nos dará una fila a la vez
+            headers = next(reader, None)  # intentamos leer la primera fila como cabeceras
+
+            # construimos un mapa para encontrar las columnas del CSV por su nombre
+            index = {}  # diccionario que nos dirá en qué columna está cada campo
+            if headers:  # si encontramos cabeceras en la primera fila
+                # posición de cada cabecera ya limpia y en minúsculas (gana la primera si se repite)
+                header_pos = {}
+                for i, c in enumerate(headers):
+                    header_pos.setdefault(c.strip().lower(), i)
+                for key, names in _ALIASES:  # por cada campo que necesitamos
+                    for nm in names:  # probamos cada nombre posible
+                        if nm in header_pos:  # si encontramos este nombre en las cabeceras
+                            index[key] = header_pos[nm]  # guardamos en qué columna está
+                            break  # no necesitamos seguir buscando
+
+            # resolvemos una sola vez qué columna del CSV alimenta cada campo del Record
+            if headers and index:  # si detectamos cabeceras y tenemos el mapa de columnas
+                # los campos que no aparecen leen la posición -1: un '' que agregamos al final de
+                # cada fila, así nunca toman el valor de una columna real que no mapeamos
+                slots = tuple(index.get(k, -1) for k in _FIELD_ORDER)  # posición de cada campo en la fila
+            else:
+                # si no hay cabecera reconocible tomamos los primeros 9 campos en orden
+                slots = tuple(range(len(_FIELD_ORDER)))
+            pad = -1 in slots  # hace falta la columna vacía de relleno
+            width = max(slots) + 1  # largo mínimo que debe tener una fila para poder leerla
+            pick = itemgetter(*slots)  # extractor en C que toma las 9 columnas de golpe
+
+            # guardamos los métodos en variables locales para no buscarlos en cada fila
+            ll_append = ll.append  # agregar al final de la lista
+            stk_push = stk.push  # apilar
+            q_enqueue = q.enqueue  # encolar
+            tree_insert = tree.insert  # indexar en el árbol
+            make_record = Record  # constructor del registro (evita buscar el nombre global)
+            strip = str.strip  # limpieza de espacios (evita buscar el builtin)
+            intern = sys.intern  # tabla de textos compartidos del intérprete
+            parse_date = Record.parse_date_text  # conversión de texto a fecha
+            # fechas ya convertidas en esta carga, por texto: se repiten muchísimo, así que cada
+            # texto distinto se convierte una sola vez y los registros comparten el objeto
+            date_cache = {}
+
+            # procesamos cada fila de datos del CSV una por una
+            for row in reader:  # por cada línea que quede en el archivo
+                try:  # intentamos procesar esta fila, si falla la saltamos
+                    if len(row) < width:  # si la fila viene incompleta
+                        row = row + [''] * (width - len(row))  # rellenamos con vacíos
+                    if pad:  # columna vacía para los campos ausentes
+                        row.append('')
+                    # extraemos y limpiamos las 9 columnas en lote (itemgetter y map trabajan en C)
+                    cid, first, last, company, city, country, email, text, web = map(strip, pick(row))
+                    if text in date_cache:  # este texto de fecha ya apareció antes
+                        sub = date_cache[text]
+                    else:
+                        sub = date_cache[text] = parse_date(text) if text else None
+                    # nombres, apellidos y países se repiten muchísimo: compartimos una sola copia de
+                    # cada texto, así ocupan menos memoria y comparar dos iguales es comparar identidad
+                    rec = make_record(cid, intern(first), intern(last), company, city,
+                                      intern(country), email, sub, web)
+                except Exception:
+                    # Si la fila no se puede parsear, saltarla
+                    continue
 
-            # Agregar registros a las estructuras propias
-            ll.append(rec)  # conservar orden original
-            stk.push(rec)  # añadir a la pila
-            q.enqueue(rec)  # añadir a la cola
-            tree.insert(rec)  # indexar en el AVLTree
-            count += 1  # incrementar contador
+                # Agregar registros a las estructuras propias
+                ll_append(rec)  # conservar orden original
+                stk_push(rec)  # añadir a la pila
+                q_enqueue(rec)  # añadir a la cola
+                tree_insert(rec)  # indexar en el AVLTree
+                count += 1  # incrementar contador
 
-            # Actualizar min/max de suscripción si está presente
-            if rec.subscription_date:
-                if (min_date is None) or (rec.subscription_date < min_date):
-                    min_date = rec.subscription_date
-                if (max_date is None) or (rec.subscription_date > max_date):
-                    max_date = rec.subscription_date
+    # fechas extremas de suscripción: una sola pasada al final con min/max (en C),
+    # en lugar de dos comparaciones en Python por cada fila durante la carga
+    dates = [rec.subscription_date for rec in ll if rec.subscription_date]  # lista temporal
+    if dates:
+        min_date = min(dates)
+        max_date = max(dates)
 
     stats = {'count': count, 'min_date': min_date, 'max_date': max_date}  # paquete de estadísticas
     return tree, ll, stk, q, stats
@@ -142,16 +214,26 @@ def print_first_n_from_list(ll: LinkedList, n=None, sort_info=None):
     i = 0  # llevamos la cuenta de cuántos hemos mostrado
     start_time = time.time()  # medimos tiempo para bases grandes
     
+    # juntamos las líneas en un buffer temporal y las escribimos por bloques:
+    # una escritura cada 4096 líneas en lugar de un print() por registro
+    buf = []
+    write = sys.stdout.write
     for rec in ll:  # recorremos cada registro
         if i >= records_to_show:  # si ya mostramos la cantidad solicitada
             break  # paramos aquí
         i += 1  # aumentamos el contador
-        print(f'{i:8,d}: {str(rec)}')  # formato con comas para números grandes
+        buf.append(f'{i:8,d}: {rec}\n')  # formato con comas para números grandes
         
         # mostrar progreso cada 1000 registros en bases grandes (solo si mostramos muchos)
         if records_to_show > 1000 and i % 1000 == 0:
             elapsed = time.time() - start_time
-            print(f'[PROGRESO: {i:,}/{records_to_show:,} registros mostrados - {elapsed:.1f}s transcurridos]')
+            buf.append(f'[PROGRESO: {i:,}/{records_to_show:,} registros mostrados - {elapsed:.1f}s transcurridos]\n')
+
+        if len(buf) >= 4096:  # bloque lleno: lo enviamos de una vez
+            write(''.join(buf))
+            buf.clear()
+    if buf:  # enviamos lo que haya quedado pendiente
+        write(''.join(buf))
     
     elapsed_total = time.time() - start_time
     print('=' * 100)  # línea separadora final
@@ -167,110 +249,86 @@ def print_first_n_from_list(ll: LinkedList, n=None, sort_info=None):
             print(f'RESUMEN: {i:,} de {total_records:,} registros mostrados en {elapsed_total:.2f} segundos')  # resumen original
 
 
-def search_by_field_in_tree(tree: AVLTree, field_name, value):
-    # Esta función busca clientes en el árbol binario por cualquier campo específico
-    # Es muy eficiente porque aprovecha la estructura del árbol para buscar rápidamente
-    def pred(r):
-        v = getattr(r, field_name, None)  # extraemos el valor del campo que nos interesa del registro
-        if v is None:  # si el campo no existe o está vacío
-            return False  # este registro no nos sirve
-        try:
-            return str(v).lower() == str(value).lower()  # comparamos ignorando mayúsculas y minúsculas
-        except Exception:  # por si hay algún problema con la conversión
-            return False  # mejor no incluir este registro
-
-    out = LinkedList()  # creamos una lista nueva para guardar todos los resultados
-    for r in tree.find_by_predicate(pred):  # le pedimos al árbol que nos dé todos los que cumplen la condición
-        out.append(r)  # agregamos cada resultado a nuestra lista
-    return out  # devolvemos todos los registros que encontramos
-
-
-def search_by_field_in_stack(stk: Stack, field_name, value):
-    # Esta función busca en la pila pero es más lenta que el árbol
-    # Tiene que revisar elemento por elemento desde arriba hasta abajo
-    temp_stack = Stack()  # necesitamos otra pila para no perder los datos originales
+def print_records(records, prefix='  '):
+    """Imprime cada registro en su propia línea, escribiendo por bloques de 4096 líneas."""
+    buf = []
+    write = sys.stdout.write
+    for r in records:
+        buf.append(f'{prefix}{r}\n')
+        if len(buf) >= 4096:  # bloque lleno: lo enviamos de una vez
+            write(''.join(buf))
+            buf.clear()
+    if buf:  # enviamos lo que haya quedado pendiente
+        write(''.join(buf))
+
+
+def build_field_index(records, field_name):
+    # Esta función construye un árbol AVL cuya clave es el valor del campo en minúsculas
+    # Con él una búsqueda exacta baja por el árbol en O(log n) en vez de revisar todos los nodos
+    # Dentro de cada clave los registros quedan en el orden en que llegan en `records`
+    get_field = attrgetter(field_name)  # lector del campo implementado en C
+    idx = AVLTree(keyfn=lambda r: str(get_field(r)).lower())  # clave sin distinguir mayúsculas
+    with gc_paused():  # los nodos del índice se conservan, no hace falta recolectar
+        for rec in records:  # recorremos la base una sola vez
+            if get_field(rec) is not None:  # los registros sin valor nunca coinciden
+                idx.insert(rec)  # indexamos el registro por su valor
+    return idx  # índice listo para búsquedas exactas
+
+
+def _scan_field(items, get_field, needle):
+    # recorrido lineal común a la pila y a la cola: compara el campo en minúsculas con needle
     out = LinkedList()  # aquí vamos guardando lo que encontramos
-    
-    # Sacamos todos los elementos de la pila original para revisarlos
-    while not stk.is_empty():  # mientras queden elementos por revisar
-        rec = stk.pop()  # sacamos el que está arriba
-        temp_stack.push(rec)  # lo guardamos en la pila temporal para no perderlo
-        
-        v = getattr(rec, field_name, None)  # obtenemos el valor del campo a buscar
+    for rec in items:  # en el orden en que saldrían, sin sacar elementos
+        v = get_field(rec)  # obtenemos el valor del campo a buscar
         try:
-            if v and str(v).lower() == str(value).lower():  # si coincide con lo que buscamos
+            if v and str(v).lower() == needle:  # si coincide con lo que buscamos
                 out.append(rec)  # lo agregamos a los resultados
         except Exception:  # si hay algún error
             continue  # seguimos con el siguiente
-    
-    # Ahora devolvemos todos los elementos a la pila original como estaban
-    while not temp_stack.is_empty():  # mientras tengamos elementos guardados
-        stk.push(temp_stack.pop())  # los devolvemos a la pila original
-    
     return out  # regresamos todos los resultados encontrados
 
 
-def search_by_field_in_queue(q: Queue, field_name, value):
-    # Esta función busca en la cola, también es lenta como la pila
-    # La diferencia es que revisamos desde el primero hasta el último
-    temp_list = LinkedList()  # usamos una lista temporal para guardar todo
-    out = LinkedList()  # aquí ponemos los resultados de la búsqueda
-    
-    # Sacamos todos los elementos de la cola para revisarlos
-    while not q.is_empty():  # mientras haya elementos en la cola
-        rec = q.dequeue()  # sacamos el primero de la fila
-        temp_list.append(rec)  # lo guardamos para no perderlo
-        
-        v = getattr(rec, field_name, None)  # obtenemos el valor del campo
-        try:
-            if v and str(v).lower() == str(value).lower():  # si es lo que buscamos
-                out.append(rec)  # lo agregamos a los resultados
-        except Exception:  # si algo sale mal
-            continue  # continuamos con el siguiente elemento
-    
-    # Regresamos todos los elementos a la cola en el mismo orden
-    for rec in temp_list:  # por cada elemento que guardamos
-        q.enqueue(rec)  # lo volvemos a meter a la cola
-    
-    return out  # devolvemos todo lo que encontramos
+def compare_searches(idx: AVLTree, stk: Stack, q: Queue, field_name, value):
+    """Busca el mismo valor en el índice AVL, la pila y la cola y mide cada búsqueda.
+
+    La preparación (texto en minúsculas y lector del campo) se hace una sola vez,
+    fuera de lo que se mide. Retorna (res_arbol, res_pila, res_cola, t_arbol,
+    t_pila, t_cola), con los tiempos en segundos.
+    """
+    needle = str(value).lower()  # la búsqueda en minúsculas, compartida por las tres
+    get_field = attrgetter(field_name)  # lector del campo implementado en C
+    clock = time.perf_counter_ns  # reloj entero en nanosegundos
+
+    t0 = clock()
+    res_tree = idx.find(needle)  # el índice ya guarda las claves en minúsculas
+    t1 = clock()
+    res_stack = _scan_field(stk, get_field, needle)
+    t2 = clock()
+    res_queue = _scan_field(q, get_field, needle)
+    t3 = clock()
+    return res_tree, res_stack, res_queue, (t1 - t0) / 1e9, (t2 - t1) / 1e9, (t3 - t2) / 1e9
 
 
 def search_by_date_range(tree_or_structure, start_date, end_date):
     # Busca registros por rango de fechas de suscripción
-    # Acepta AVLTree, Stack, Queue o LinkedList
+    # Acepta un AVLTree (idealmente el de build_date_index), Stack, Queue o LinkedList
     out = LinkedList()  # resultados
 
-    def check(r):
-        if not r.subscription_date:  # si no tiene fecha
-            return False
-        return start_date <= r.subscription_date <= end_date  # verificar rango
+    if isinstance(tree_or_structure, AVLTree) and tree_or_structure.keyfn is _DATE_KEY:
+        # árbol por fecha: solo visita las ramas del rango
+        for r in tree_or_structure.range(start_date, end_date):
+            out.append(r)
+    elif isinstance(tree_or_structure, AVLTree):  # árbol con otra clave: revisamos todos sus registros
+        def check(r):
+            d = r.subscription_date
+            return d is not None and start_date <= d <= end_date  # verificar rango
 
-    if hasattr(tree_or_structure, 'find_by_predicate'):  # es AVLTree
         for r in tree_or_structure.find_by_predicate(check):
             out.append(r)
-    elif isinstance(tree_or_structure, Stack):  # es Stack
-        temp_stack = Stack()
-        while not tree_or_structure.is_empty():
-            rec = tree_or_structure.pop()
-            temp_stack.push(rec)
-            if check(rec):
-                out.append(rec)
-        # Restaurar stack
-        while not temp_stack.is_empty():
-            tree_or_structure.push(temp_stack.pop())
-    elif isinstance(tree_or_structure, Queue):  # es Queue
-        temp_list = LinkedList()
-        while not tree_or_structure.is_empty():
-            rec = tree_or_structure.dequeue()
-            temp_list.append(rec)
-            if check(rec):
-                out.append(rec)
-        # Restaurar queue
-        for rec in temp_list:
-            tree_or_structure.enqueue(rec)
-    else:  # es LinkedList u otra estructura iterable
+    else:  # Stack, Queue o LinkedList: se recorren en su orden de salida sin modificarlos
         for r in tree_or_structure:
-            if check(r):
+            d = r.subscription_date  # comparación en línea
+            if d and start_date <= d <= end_date:
                 out.append(r)
     return out
 
@@ -290,7 +348,6 @@ def interactive_menu():
     last_sort_field = None
     # arbol construido con la clave del ultimo orden (para opcion 8)
     tree_for_last_sort = None
-    tree_for_last_sort = None
 
     # si existe BusinessData.csv en el folder, preguntamos si cargarla al inicio
     default_csv = os.path.join(os.path.dirname(__file__), 'BusinessData.csv')  # ruta por defecto
@@ -298,6 +355,9 @@ def interactive_menu():
         ans = input(f"Se encontro 'BusinessData.csv' en el proyecto. Cargarla ahora? (s/n): ").strip().lower()  # solicitar confirmación
         if ans == 's':
             tree, ll, stk, q, stats = load_csv(default_csv)  # cargar CSV predeterminado
+            # el arbol principal ya esta indexado por customer_id (clave por defecto de load_csv):
+            # la opcion 8 lo reutiliza en vez de armar otro igual
+            indices['customer_id'] = tree
             print(f'Cargados {stats["count"]} registros. Fecha min: {stats["min_date"]} max: {stats["max_date"]}')  # mostrar resumen
     while True:
         # Mostrar información dinámica del sistema
@@ -317,73 +377,21 @@ def interactive_menu():
         print('8. Mostrar arbol binario')  # opción 8: visualización árbol
         print('0. Salir')  # opción 0: salir del programa
         opt = input('Seleccione una opcion: ').strip()  # leer la opción seleccionada por el usuario
-        if opt == '1':
-            # Ordenar por Customer Id
+        if opt in _SORTS:
+            # Ordenar por el campo de la opción (1-4)
             if ll is None:
                 print('Primero cargue la base (cargue el archivo al iniciar)')  # indicar que no hay datos cargados
                 continue
-            field = 'customer_id'  # campo a usar como clave
-            keyfn = lambda r: getattr(r, field, None)  # función que extrae la clave de un record
-            # usamos MergeSort por defecto
-            ll = merge_sort_linkedlist(ll, keyfn)  # ordenar la linked list usando merge sort
-            last_sort_field = field  # recordar último campo usado para ordenar
-            # construyo arbol indexado por este campo para opcion 8
-            tree_for_last_sort = AVLTree(keyfn=lambda r: getattr(r, field, None))  # nuevo árbol índice
-            for rec in ll:
-                tree_for_last_sort.insert(rec)  # poblar árbol con registros ordenados
-            print(f'Ordenado por Customer Id (merge sort). Total registros: {ll.size()}')  # informar resultado completo
+            field, sort_fn, sort_name, header = _SORTS[opt]
+            # si la lista ya quedó ordenada por este campo, ordenarla otra vez daría lo mismo
+            if last_sort_field != field:
+                ll = sort_fn(ll, attrgetter(field))  # ordenar la linked list con el algoritmo de la opción
+                last_sort_field = field  # recordar último campo usado para ordenar
+                tree_for_last_sort = None  # el arbol de la opcion 8 se construye solo si se pide
+            print(f'Ordenado por {sort_name}. Total registros: {ll.size()}')  # informar resultado completo
             # mostrar todos los registros resultantes para verificar el ordenamiento completo
-            print('\nTodos los registros despues de ordenar por Customer ID:')
-            print_first_n_from_list(ll, None, 'Customer ID (merge sort)')  # incluir información del ordenamiento
-        elif opt == '2':
-            # Ordenar por First Name usando merge sort
-            if ll is None:
-                print('Primero cargue la base (cargue el archivo al iniciar)')  # verificar datos cargados
-                continue
-            field = 'first_name'  # ordenar por nombre
-            keyfn = lambda r: getattr(r, field, None)
-            ll = merge_sort_linkedlist(ll, keyfn)  # merge sort para nombres
-            last_sort_field = field
-            sort_name = 'First Name (merge sort)'
-            # construyo tambien el arbol para la opcion 8
-            tree_for_last_sort = AVLTree(keyfn=lambda r: getattr(r, field, None))
-            for rec in ll:
-                tree_for_last_sort.insert(rec)  # poblar índice con orden actual
-            print(f'Ordenado por {sort_name}. Total registros: {ll.size()}')
-            print('\nTodos los registros despues de ordenar por First Name:')
-            print_first_n_from_list(ll, None, sort_name)  # mostrar con información de ordenamiento
-        elif opt == '3':
-            # Ordenar por Subscription Date usando quick sort
-            if ll is None:
-                print('Primero cargue la base (cargue el archivo al iniciar)')  # verificar datos cargados
-                continue
-            field = 'subscription_date'  # ordenar por fecha de suscripción
-            keyfn = lambda r: getattr(r, field, None)
-            ll = quick_sort_linkedlist(ll, keyfn)  # quick sort para fechas
-            last_sort_field = field
-            sort_name = 'Subscription Date (quick sort)'
-            # construyo tambien el arbol para la opcion 8
-            tree_for_last_sort = AVLTree(keyfn=lambda r: getattr(r, field, None))
-            for rec in ll:
-                tree_for_last_sort.insert(rec)  # poblar índice con orden actual
-            print(f'Ordenado por {sort_name}. Total registros: {ll.size()}')
-            print('\nTodos los registros despues de ordenar por Subscription Date:')
-            print_first_n_from_list(ll, None, sort_name)  # mostrar con información de ordenamiento
-        elif opt == '4':
-            # Ordenar por Country
-            if ll is None:
-                print('Primero cargue la base (cargue el archivo al iniciar)')  # comprobar datos cargados
-                continue
-            field = 'country'  # campo país
-            keyfn = lambda r: getattr(r, field, None)
-            ll = merge_sort_linkedlist(ll, keyfn)  # ordenar por país
-            last_sort_field = field
-            tree_for_last_sort = AVLTree(keyfn=lambda r: getattr(r, field, None))
-            for rec in ll:
-                tree_for_last_sort.insert(rec)
-            print(f'Ordenado por Country (merge sort). Total registros: {ll.size()}')
-            print('\nTodos los registros despues de ordenar por pais:')
-            print_first_n_from_list(ll, None, 'Country (merge sort)')  # incluir información del ordenamiento
+            print(f'\nTodos los registros despues de ordenar por {header}:')
+            print_first_n_from_list(ll, None, sort_name)  # incluir información del ordenamiento
         elif opt == '5':
             # Mostrar primeros n registros o todos
             if ll is None:
@@ -402,13 +410,9 @@ def interactive_menu():
                     n = None
             # Determinar información del último ordenamiento
             if last_sort_field:
-                sort_methods = {
-                    'customer_id': 'Customer ID (merge sort)',
-                    'first_name': 'First Name (merge sort)', 
-                    'subscription_date': 'Subscription Date (quick sort)',
-                    'country': 'Country (merge sort)'
-                }
-                sort_info = sort_methods.get(last_sort_field, f'{last_sort_field} (ordenamiento aplicado)')
+                # la etiqueta sale de la misma tabla que usan las opciones 1-4
+                sort_info = next((label for f, _, label, _ in _SORTS.values() if f == last_sort_field),
+                                 f'{last_sort_field} (ordenamiento aplicado)')
             else:
                 sort_info = None
             print_first_n_from_list(ll, n, sort_info)  # imprimir con información de ordenamiento
@@ -427,23 +431,18 @@ def interactive_menu():
                 
                 print(f'\\nBuscando "{value}" en campo {field} en base de datos de {ll.size():,} registros...')  # informar tamaño
                 
-                # Búsqueda en árbol (más eficiente para cualquier tamaño)
-                t0 = time.perf_counter()  # tiempo inicial con alta precisión
-                results_tree = search_by_field_in_tree(tree, field, value)  # buscar en árbol
-                t1 = time.perf_counter()  # tiempo final
-                time_tree = t1 - t0  # calcular tiempo exacto
-                
-                # Búsqueda en pila (menos eficiente)
-                t2 = time.perf_counter()
-                results_stack = search_by_field_in_stack(stk, field, value)  # buscar en pila
-                t3 = time.perf_counter()
-                time_stack = t3 - t2
-                
-                # Búsqueda en cola (menos eficiente)
-                t4 = time.perf_counter()
-                results_queue = search_by_field_in_queue(q, field, value)  # buscar en cola
-                t5 = time.perf_counter()
-                time_queue = t5 - t4
+                # Construir índice por el campo si no existe (una sola vez por campo)
+                key = (field, 'lower')  # índice por valor en minúsculas
+                if key not in indices:
+                    print(f'Construyendo indice por {field}...')  # informar construcción
+                    # lo llenamos desde el árbol principal para que las coincidencias salgan
+                    # ordenadas por customer_id, sin importar cómo esté ordenada ll ahora
+                    indices[key] = build_field_index(tree.inorder(), field)  # crear índice
+                    print('Indice construido.')  # confirmar
+
+                # búsqueda en el árbol índice (más eficiente), en la pila y en la cola, cada una medida
+                results_tree, results_stack, results_queue, time_tree, time_stack, time_queue = \
+                    compare_searches(indices[key], stk, q, field, value)
                 
                 # Mostrar resultados y tiempos con formato optimizado
                 print(f'\\nResultados de búsqueda en base de {ll.size():,} registros:')  # cabecera con tamaño
@@ -459,8 +458,7 @@ def interactive_menu():
                 # Mostrar todos los registros encontrados sin limitaciones
                 if results_tree.size() > 0:
                     print(f'\nTodos los registros encontrados en la búsqueda:')  # mostrar resultados completos
-                    for r in results_tree:  # iterar sobre todos los resultados
-                        print(f'  {r}')  # imprimir cada registro encontrado
+                    print_records(results_tree)  # imprimir cada registro encontrado
                     print(f'\nTotal de coincidencias: {results_tree.size()} registros')  # resumen final
                 else:
                     print('No se encontraron registros con ese criterio en toda la base de datos.')  # búsqueda exhaustiva sin resultados
@@ -476,11 +474,18 @@ def interactive_menu():
                     print('Formato de fecha invalido')  # error formato
                     continue
                 
+                # índice AVL por fecha (el mismo que usa la opción 8 tras ordenar por fecha)
+                if 'subscription_date' not in indices:
+                    print('Construyendo indice por subscription_date...')  # informar construcción
+                    indices['subscription_date'] = build_date_index(
+                        ll, presorted=last_sort_field == 'subscription_date')  # crear índice
+                    print('Indice construido.')  # confirmar
+
                 print(f'\nBuscando registros entre {d1} y {d2} en base de {ll.size():,} registros...')  # informar búsqueda con tamaño
                 
                 # Búsqueda en árbol
                 t0 = time.perf_counter()
-                res_tree = search_by_date_range(tree, d1, d2)  # buscar en árbol
+                res_tree = search_by_date_range(indices['subscription_date'], d1, d2)  # buscar en árbol por fecha
                 t1 = time.perf_counter()
                 time_tree = t1 - t0
                 
@@ -505,8 +510,7 @@ def interactive_menu():
                 # Mostrar todos los resultados del rango de fechas
                 if res_tree.size() > 0:
                     print(f'\nTodos los registros en el rango de fechas {d1} a {d2}:')  # mostrar rango completo
-                    for r in res_tree:  # mostrar cada registro del rango
-                        print(f'  {r}')  # imprimir registro completo
+                    print_records(res_tree)  # mostrar cada registro del rango
                     print(f'\nTotal de registros en el rango: {res_tree.size()}')  # conteo final
                 else:
                     print('No hay registros en ese rango de fechas en toda la base de datos.')  # búsqueda completa sin resultados
@@ -522,42 +526,30 @@ def interactive_menu():
             # Construir índice por país si no existe
             if 'country' not in indices:
                 print('Construyendo indice por pais...')  # informar construcción
-                idx = AVLTree(keyfn=lambda r: getattr(r, 'country', None))  # crear índice
-                for rec in ll:  # poblar índice
-                    idx.insert(rec)
-                indices['country'] = idx  # guardar índice
+                indices['country'] = build_tree_index(ll, attrgetter('country'))  # crear y guardar índice
                 print('Indice construido.')  # confirmar
             
             country_idx = indices['country']  # obtener índice
             
-            # Contar países únicos
-            total_countries = 0  # contador países
-            for _ in country_idx.items():  # iterar claves únicas
-                total_countries += 1
+            # Contar países únicos: el árbol lleva la cuenta de sus claves distintas
+            total_countries = len(country_idx)  # contador países
             print(f'\\nEstadísticas de base de datos con {ll.size():,} registros:')  # contexto de tamaño
             print(f'Total de países diferentes: {total_countries:,}')  # formato con comas
             
-            # Crear lista de países con conteos optimizada
-            class CountryCount:
-                def __init__(self, country, count):
-                    self.country = country  # nombre país
-                    self.count = count  # número clientes
-                def __str__(self):
-                    return f'{self.country}: {self.count:,} clientes'  # formato con comas para números grandes
-            
+            # pares (país, clientes) en una lista enlazada; las tuplas evitan definir una clase en cada consulta
             cc_list = LinkedList()  # lista países-conteos
             for key, records in country_idx.items():  # por cada país
-                cc_list.append(CountryCount(key, records.size()))  # agregar conteo
+                cc_list.append((key, records.size()))  # agregar conteo
             
-            # Ordenar por conteo descendente
-            cc_sorted = merge_sort_linkedlist(cc_list, keyfn=lambda x: -x.count)  # ordenar desc
+            # Ordenar por conteo descendente (estable: a igual conteo quedan en orden alfabético)
+            cc_sorted = merge_sort_linkedlist(cc_list, keyfn=lambda p: -p[1])  # ordenar desc
             
             # Mostramos todos los países sin preguntar porque queremos información completa
             print('\nTodos los clientes por pais (ordenados de mayor a menor):')  # mostrar todo
             
-            # Recorremos y mostramos cada país con su cantidad de clientes
-            for item in cc_sorted:  # por cada país en orden descendente
-                print(f'  {item}')  # mostramos el país y cuántos clientes tiene
+            # Recorremos cada país con su cantidad de clientes y escribimos todas las líneas de una vez
+            sys.stdout.write(''.join([f'  {country}: {count:,} clientes\n'  # país y cuántos clientes tiene
+                                      for country, count in cc_sorted]))  # por cada país en orden descendente
             
             print(f'\nResumen completo: {cc_sorted.size()} paises diferentes en total')  # resumen final
             
@@ -570,33 +562,46 @@ def interactive_menu():
                 
         elif opt == '8':
             # Mostrar árbol binario por niveles
-            if tree_for_last_sort is None:
+            if last_sort_field is None:
                 print('No hay criterio de orden aplicado aun. Ordene por algun campo primero (opciones 1-4).')  # sin orden
                 continue
+            if tree_for_last_sort is None:  # recuperamos el arbol del campo desde la cache de indices
+                field = last_sort_field  # campo del ultimo ordenamiento
+                if field not in indices:  # cada campo se indexa una sola vez (la opcion 7 comparte 'country')
+                    # guardamos el árbol para reutilizarlo en proximos ordenamientos
+                    # ll sigue ordenada por este campo, así que el árbol se arma sin rotaciones
+                    if field == 'subscription_date':  # el mismo índice de la búsqueda por rango
+                        indices[field] = build_date_index(ll, presorted=True)
+                    else:
+                        indices[field] = build_tree_index(ll, attrgetter(field), presorted=True)
+                tree_for_last_sort = indices[field]
             
             print(f'\nArbol binario por niveles (ordenado por {last_sort_field}):')  # cabecera
             print('Formato: clave - numero_de_registros')  # formato explicación
             print('----------------------------------------')  # separador
             
-            level = 0  # empezamos desde el nivel 0 (la raíz)
-            nodes_in_level = 1  # en el primer nivel solo hay un nodo
-            nodes_printed = 0  # contador de nodos que hemos mostrado en este nivel
+            level = -1  # nivel del último nodo mostrado (todavía ninguno)
             total_nodes = 0  # contador total de nodos en el árbol
             
-            # Recorremos todo el árbol nivel por nivel sin limitaciones
-            for key, records in tree_for_last_sort.level_order():  # obtenemos cada nodo por niveles
-                if nodes_printed == 0:  # si es el primer nodo del nivel
-                    print(f'Nivel {level}:')  # mostramos qué nivel estamos viendo
+            # Recorremos todo el árbol nivel por nivel sin limitaciones; level_order nos da el nivel de cada nodo
+            # las líneas se juntan en un buffer temporal y se escriben por bloques de 4096,
+            # así un árbol enorme no obliga a tener toda la salida en memoria
+            buf = []
+            write = sys.stdout.write
+            for depth, key, records in tree_for_last_sort.level_order():  # obtenemos cada nodo por niveles
+                if depth != level:  # si es el primer nodo del nivel
+                    if level >= 0:
+                        buf.append('\n')  # dejamos una línea en blanco para separar niveles
+                    level = depth
+                    buf.append(f'Nivel {level}:\n')  # mostramos qué nivel estamos viendo
                 
-                print(f'  {key} - {records.size()} registros')  # mostramos la clave y cuántos registros tiene
-                nodes_printed += 1  # contamos que ya mostramos este nodo
+                buf.append(f'  {key} - {records.size()} registros\n')  # mostramos la clave y cuántos registros tiene
                 total_nodes += 1  # contamos el nodo total
-                
-                if nodes_printed >= nodes_in_level:  # si ya mostramos todos los nodos de este nivel
-                    level += 1  # pasamos al siguiente nivel
-                    nodes_in_level *= 2  # el siguiente nivel puede tener el doble de nodos
-                    nodes_printed = 0  # reiniciamos el contador del nivel
-                    print()  # dejamos una línea en blanco para separar niveles
+                if len(buf) >= 4096:  # bloque lleno: lo enviamos de una vez
+                    write(''.join(buf))
+                    buf.clear()
+            if buf:  # enviamos lo que haya quedado pendiente
+                write(''.join(buf))
             
             print(f'\nArbol completo: {total_nodes:,} nodos distribuidos en {level + 1} niveles')  # resumen con formato
         elif opt == '0':
@@ -613,7 +618,7 @@ if __name__ == '__main__':  # esta línea se ejecuta solo cuando corremos este a
             t, ll, s, q, stats = load_csv(sample)  # cargamos los datos de prueba
             print('Carga sample:', stats)  # mostramos las estadísticas de la carga
             print('Primeros 3 por ID:')  # anunciamos que vamos a mostrar los primeros 3
-            sorted_ll = merge_sort_linkedlist(ll, lambda r: r.customer_id)  # ordenamos por ID
+            sorted_ll = merge_sort_linkedlist(ll, attrgetter('customer_id'))  # ordenamos por ID
             print_first_n_from_list(sorted_ll, 3)  # mostramos solo los primeros 3 registros
         else:  # si no existe el archivo de prueba
             print('No hay sample.csv; ejecuta main sin --test para usar el menu')  # informamos al usuario
@@ -60,6 +60,16 @@ class Record:
         s = str(value).strip()  # convertimos a texto y quitamos espacios en blanco
         if not s:  # si después de limpiar queda vacío
             return None  # no hay fecha válida
+        return self.parse_date_text(s)  # lo convertimos
+
+    @staticmethod
+    def parse_date_text(s):  # conversión real de un texto de fecha ya limpio (load_csv la usa directo)
+        # caso más común, AAAA-MM-DD: fromisoformat está escrito en C y es mucho más rápido que strptime
+        if len(s) == 10 and s[4] == "-" and s[7] == "-":
+            try:
+                return date.fromisoformat(s)
+            except ValueError:  # por ejemplo una fecha imposible; la revisan los formatos de abajo
+                pass
         # probamos diferentes formatos comunes de fecha hasta encontrar uno que funcione
         for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d"):  # formatos: año-mes-día, día/mes/año, año/mes/día
             try:  # intentamos convertir con este formato
@@ -4,7 +4,7 @@ Implementa versiones que operan sobre la `LinkedList` propia del proyecto.
 Los algoritmos devuelven nuevas listas enlazadas ordenadas.
 """
 
-from structures import LinkedList
+from structures import LinkedList, Queue
 
 
 def _normalize_key(keyfn, record):
@@ -40,62 +40,96 @@ def _normalize_key(keyfn, record):
         return (2, "")  # si no se puede convertir, va al final
 
 
-def split_linkedlist(ll: LinkedList):
-    """Divide una linked list en dos mitades y devuelve (left, right).
+def _decorate(ll: LinkedList, keyfn):
+    """Calcula la clave normalizada de cada registro una sola vez.
 
-    Nota: esto no modifica los datos originales; construye dos nuevas listas
-    que contienen los mismos elementos referenciados.
+    Devuelve una lista de pares (clave, registro). Así los algoritmos comparan
+    claves ya preparadas en lugar de llamar a _normalize_key en cada comparación.
     """
-    if ll.head is None or ll.head.next is None:  # si la lista está vacía o tiene solo un elemento
-        left = LinkedList()  # creamos una lista vacía para la izquierda
-        cur = ll.head  # empezamos desde el primer elemento
-        while cur:  # mientras haya elementos
-            left.append(cur.data)  # copiamos cada elemento a la lista izquierda
-            cur = cur.next  # pasamos al siguiente
-        right = LinkedList()  # la lista derecha queda vacía
-        return left, right  # devolvemos las dos mitades
-
-    slow = ll.head  # puntero lento: avanza de uno en uno
-    fast = ll.head  # puntero rápido: avanza de dos en dos
-    while fast.next and fast.next.next:  # mientras el rápido pueda avanzar dos pasos
-        slow = slow.next  # el lento avanza uno
-        fast = fast.next.next  # el rápido avanza dos
-
-    # slow queda al final de la primera mitad
-    left = LinkedList()  # creamos la lista para la primera mitad
-    cur = ll.head  # empezamos desde el principio
-    while cur is not None and cur is not slow.next:  # hasta donde marca el puntero lento
-        left.append(cur.data)  # copiamos elementos a la primera mitad
-        cur = cur.next  # avanzamos
-
-    right = LinkedList()  # creamos la lista para la segunda mitad
-    cur = slow.next  # empezamos desde donde terminó la primera mitad
-    while cur:  # hasta el final
-        right.append(cur.data)  # copiamos elementos a la segunda mitad
-        cur = cur.next  # avanzamos
-
-    return left, right  # devolvemos las dos mitades
-
-
-def merge_sorted(left: LinkedList, right: LinkedList, keyfn):
-    """Fusiona dos listas ya ordenadas según keyfn."""
-    result = LinkedList()  # creamos una nueva lista para el resultado
-    a = left.head  # puntero al primer elemento de la lista izquierda
-    b = right.head  # puntero al primer elemento de la lista derecha
-    while a and b:  # mientras tengamos elementos en ambas listas
-        if _normalize_key(keyfn, a.data) <= _normalize_key(keyfn, b.data):  # si el elemento de la izquierda es menor o igual
-            result.append(a.data)  # lo agregamos al resultado
-            a = a.next  # avanzamos en la lista izquierda
-        else:  # si el elemento de la derecha es menor
-            result.append(b.data)  # lo agregamos al resultado
-            b = b.next  # avanzamos en la lista derecha
-    while a:  # si quedan elementos en la lista izquierda
-        result.append(a.data)  # los agregamos todos
-        a = a.next  # avanzamos
-    while b:  # si quedan elementos en la lista derecha
-        result.append(b.data)  # los agregamos todos
-        b = b.next  # avanzamos
-    return result  # devolvemos la lista fusionada y ordenada
+    out = LinkedList()  # lista de pares clave-registro
+    for item in ll:  # recorremos la lista original una sola vez
+        out.append((_normalize_key(keyfn, item), item))  # guardamos la clave junto al registro
+    return out
+
+
+def _undecorate(pairs: LinkedList):
+    """Quita las claves de una lista de pares y deja solo los registros."""
+    out = LinkedList()  # lista final con los registros
+    for _, item in pairs:  # recorremos los pares ya ordenados
+        out.append(item)  # nos quedamos solo con el registro
+    return out
+
+
+def _merge_chains(a, b):
+    """Fusiona dos cadenas de nodos ordenadas reenlazando los nodos existentes.
+
+    No crea nodos nuevos: solo cambia los punteros next. A igual clave gana la
+    cadena `a` (la que venía antes), por eso el ordenamiento es estable.
+    """
+    head = tail = None  # extremos de la cadena fusionada
+    while a and b:  # mientras queden nodos en ambas cadenas
+        if a.data[0] <= b.data[0]:  # comparamos solo la clave ya calculada
+            nxt, a = a, a.next
+        else:
+            nxt, b = b, b.next
+        if tail is None:
+            head = nxt
+        else:
+            tail.next = nxt
+        tail = nxt
+    rest = a if a else b  # lo que quede ya está ordenado
+    if tail is None:
+        return rest
+    tail.next = rest
+    return head
+
+
+def _merge_sort_pairs(ll: LinkedList):
+    """Merge Sort natural sobre una lista de pares (clave, registro), en el lugar.
+
+    Primero corta la lista en tramos que ya vienen ordenados y luego los fusiona
+    de a dos, pasada tras pasada, hasta que queda uno solo. Si los datos ya
+    estaban (casi) ordenados hay muy pocos tramos y el trabajo es casi lineal.
+    Los nodos se reenlazan, no se copian.
+    """
+    if ll.head is None or ll.head.next is None:  # cero o un elemento: ya está ordenada
+        return ll
+
+    runs = Queue()  # tramos ordenados, en el orden en que aparecen
+    start = cur = ll.head
+    while cur:
+        nxt = cur.next
+        if nxt is None or nxt.data[0] < cur.data[0]:  # aquí termina un tramo ordenado
+            cur.next = None  # cortamos la cadena
+            runs.enqueue(start)
+            start = nxt
+        cur = nxt
+
+    # fusionamos tramos vecinos; el impar de cada pasada pasa al final de la siguiente
+    while True:
+        merged = Queue()
+        first = runs.dequeue()
+        second = runs.dequeue()
+        if second is None:  # queda un solo tramo: terminamos
+            break
+        while second is not None:
+            merged.enqueue(_merge_chains(first, second))
+            first = runs.dequeue()
+            second = runs.dequeue() if first is not None else None
+        if first is not None:
+            merged.enqueue(first)
+        runs = merged
+
+    # reconstruimos los punteros prev, la cola y la cabeza de la lista
+    ll.head = first
+    prev = None
+    cur = first
+    while cur:
+        cur.prev = prev
+        prev = cur
+        cur = cur.next
+    ll.tail = prev
+    return ll
 
 
 def merge_sort_linkedlist(ll: LinkedList, keyfn=lambda r: r.customer_id):
@@ -103,61 +137,83 @@ def merge_sort_linkedlist(ll: LinkedList, keyfn=lambda r: r.customer_id):
     
     Merge Sort es como ordenar dos pilas de cartas: divides todo por la mitad,
     ordenas cada mitad por separado, y luego las combinas de forma ordenada.
+    Las claves se calculan una sola vez por registro antes de empezar.
     """
-    if ll.head is None or ll.head.next is None:
-        out = LinkedList()
-        cur = ll.head
-        while cur:
-            out.append(cur.data)
-            cur = cur.next
-        return out
-
-    left, right = split_linkedlist(ll)
-    left_sorted = merge_sort_linkedlist(left, keyfn)
-    right_sorted = merge_sort_linkedlist(right, keyfn)
-    return merge_sorted(left_sorted, right_sorted, keyfn)
+    return _undecorate(_merge_sort_pairs(_decorate(ll, keyfn)))
 
 
-def quick_sort_linkedlist(ll: LinkedList, keyfn=lambda r: r.customer_id):
-    """QuickSort para linked list usando particionamiento en tres listas.
+def _quick_sort_chain(head):
+    """QuickSort recursivo sobre una cadena de nodos de pares (clave, registro).
 
-    Implementación recursiva que particiona en menores, iguales y mayores
-    respecto al pivote.
+    Reparte los nodos en tres cadenas (menores, iguales y mayores que el pivote)
+    reenlazándolos, sin crear nodos nuevos, y devuelve (cabeza, cola) de la
+    cadena ordenada. Cada nodo conserva su orden relativo, así que es estable.
     """
-    if ll.head is None or ll.head.next is None:
-        out = LinkedList()
-        cur = ll.head
-        while cur:
-            out.append(cur.data)
-            cur = cur.next
-        return out
-
-    pivot = ll.head.data
-    pk = _normalize_key(keyfn, pivot)
-
-    less = LinkedList()
-    equal = LinkedList()
-    greater = LinkedList()
-
-    cur = ll.head
+    pk = head.data[0]  # clave del pivote
+
+    lh = lt = eh = et = gh = gt = None  # cabeza y cola de menores, iguales y mayores
+    cur = head
     while cur:
-        k = _normalize_key(keyfn, cur.data)
+        nxt = cur.next
+        cur.next = None  # el nodo pasa a ser la nueva cola de su cadena
+        k = cur.data[0]  # clave ya normalizada
         if k < pk:
-            less.append(cur.data)
+            if lt is None:
+                lh = cur
+            else:
+                lt.next = cur
+            lt = cur
         elif k == pk:
-            equal.append(cur.data)
+            if et is None:
+                eh = cur
+            else:
+                et.next = cur
+            et = cur
         else:
-            greater.append(cur.data)
+            if gt is None:
+                gh = cur
+            else:
+                gt.next = cur
+            gt = cur
+        cur = nxt
+
+    if lh is not None and lh.next is not None:  # con dos o más nodos hay que ordenar
+        lh, lt = _quick_sort_chain(lh)
+    if gh is not None and gh.next is not None:
+        gh, gt = _quick_sort_chain(gh)
+
+    # unimos menores + iguales + mayores (la de iguales nunca está vacía: tiene al pivote)
+    et.next = gh
+    tail = gt if gt is not None else et
+    if lh is None:
+        return eh, tail
+    lt.next = eh
+    return lh, tail
+
+
+def _quick_sort_pairs(ll: LinkedList):
+    """QuickSort sobre una lista de pares (clave, registro), en el lugar."""
+    if ll.head is None or ll.head.next is None:  # cero o un elemento: ya está ordenada
+        return ll
+
+    first, _ = _quick_sort_chain(ll.head)
+
+    # reconstruimos los punteros prev, la cola y la cabeza de la lista
+    ll.head = first
+    prev = None
+    cur = first
+    while cur:
+        cur.prev = prev
+        prev = cur
         cur = cur.next
+    ll.tail = prev
+    return ll
 
-    less_sorted = quick_sort_linkedlist(less, keyfn) if less.head else less
-    greater_sorted = quick_sort_linkedlist(greater, keyfn) if greater.head else greater
 
-    out = LinkedList()
-    for item in less_sorted:
-        out.append(item)
-    for item in equal:
-        out.append(item)
-    for item in greater_sorted:
-        out.append(item)
-    return out
+def quick_sort_linkedlist(ll: LinkedList, keyfn=lambda r: r.customer_id):
+    """QuickSort para linked list usando particionamiento en tres listas.
+
+    Implementación recursiva que particiona en menores, iguales y mayores
+    respecto al pivote. Las claves se calculan una sola vez por registro.
+    """
+    return _undecorate(_quick_sort_pairs(_decorate(ll, keyfn)))
@@ -9,6 +9,9 @@ estructuras temporales fuera de las colecciones de núcleo.
 class Node:
     """Un nodo simple que puede contener cualquier información y conectarse con otros nodos."""
 
+    # sin __dict__ por instancia: cada nodo ocupa menos memoria (hay uno por registro y estructura)
+    __slots__ = ("data", "next", "prev")
+
     def __init__(self, data=None):
         self.data = data  # aquí guardamos la información que queremos almacenar
         self.next = None  # este apunta al siguiente nodo en la cadena
@@ -50,6 +53,9 @@ class LinkedList:
     def size(self):
         return self._size  # devolvemos cuántos elementos tenemos guardados
 
+    def __len__(self):
+        return self._size  # el contador se mantiene en cada cambio, así len() no recorre la lista
+
     def clear(self):
         self.head = None  # borramos la referencia al primer elemento
         self.tail = None  # borramos la referencia al último elemento
@@ -89,6 +95,10 @@ class Stack:
         self._list._size -= 1  # reducimos el tamaño
         return node.data  # devolvemos la información del elemento
 
+    def __iter__(self):
+        # recorre desde la cima hacia el fondo (el orden en que saldrían con pop) sin sacar nada
+        return iter(self._list)
+
     def is_empty(self):
         return self._list.head is None  # verdadero si no hay primer elemento
 
@@ -119,11 +129,17 @@ class Queue:
         self._list._size -= 1  # reducimos el tamaño
         return node.data  # devolvemos la información del elemento
 
+    def __iter__(self):
+        # recorre desde el frente hacia el final (el orden en que saldrían con dequeue) sin sacar nada
+        return iter(self._list)
+
     def is_empty(self):
         return self._list.head is None  # verdadero si no hay primer elemento
 
 
 class AVLNode:
+    __slots__ = ("key", "records", "left", "right", "height")  # nodos compactos, sin __dict__
+
     def __init__(self, key, record):
         self.key = key  # la clave por la que vamos a ordenar este nodo
         # guardamos los registros en una LinkedList para soportar claves duplicadas
@@ -146,6 +162,8 @@ class AVLTree:
         # función para obtener la clave desde un record
         self.keyfn = keyfn if keyfn else (lambda r: r.customer_id)  # cómo sacar la clave de cada registro
         self._count = 0  # llevamos la cuenta de cuántos registros hemos guardado
+        self._keys = 0  # y de cuántas claves distintas (nodos) tiene el árbol
+        self._grew = False  # si la última inserción creó un nodo (lo usa _insert)
 
     def height(self, node):
         return node.height if node else 0  # si no hay nodo, la altura es cero
@@ -176,6 +194,7 @@ class AVLTree:
 
     def _insert(self, node, key, record):
         if node is None:  # si llegamos a un lugar vacío
+            self._keys += 1  # clave nueva: un nodo más en el árbol
             return AVLNode(key, record)  # creamos un nuevo nodo aquí
         if key < node.key:  # si la clave es menor
             node.left = self._insert(node.left, key, record)  # insertamos a la izquierda
@@ -184,7 +203,10 @@ class AVLTree:
         else:  # si la clave es igual
             # clave igual: almacenamos el registro en la lista del nodo
             node.records.append(record)  # agregamos el registro a la lista existente
+            self._grew = False  # la forma del árbol no cambió
             return node  # no necesitamos balancear porque no cambió la estructura
+        if not self._grew:  # clave repetida más abajo: alturas y balances siguen iguales
+            return node
         self.update_height(node)  # recalculamos la altura de este nodo
         bf = self.balance_factor(node)  # calculamos el factor de balance
         # casos de rotación para mantener el árbol balanceado
@@ -202,10 +224,57 @@ class AVLTree:
 
     def insert(self, record):
         key = self.keyfn(record)  # extraemos la clave del registro usando nuestra función
-        # insertamos y contamos
+        self._grew = True  # _insert lo apaga si la clave ya existía
         self.root = self._insert(self.root, key, record)  # insertamos en el árbol y actualizamos la raíz
         self._count += 1  # aumentamos el contador de registros
 
+    @classmethod
+    def build_from_sorted(cls, items, keyfn=None):
+        """Construye un árbol balanceado a partir de registros ya ordenados por su clave.
+
+        Agrupa los registros con la misma clave y arma el árbol de abajo hacia
+        arriba en O(n), sin rotaciones: cada subárbol toma la mitad de los grupos,
+        así que las alturas de hermanos difieren a lo sumo en uno. Si resulta que
+        los registros no venían ordenados, se construye insertando uno por uno.
+        """
+        tree = cls(keyfn=keyfn)  # árbol vacío con la misma función de clave
+        groups = LinkedList()  # pares (clave, registros) en orden creciente
+        last = None  # último par agregado
+        for rec in items:
+            key = tree.keyfn(rec)  # clave del registro
+            if last is not None and key == last[0]:  # misma clave que el anterior
+                last[1].append(rec)
+            elif last is None or key > last[0]:  # clave nueva y mayor: abrimos otro grupo
+                last = (key, LinkedList())
+                last[1].append(rec)
+                groups.append(last)
+            else:  # no estaba ordenado: construcción normal con inserciones
+                tree = cls(keyfn=keyfn)
+                for r in items:
+                    tree.insert(r)
+                return tree
+            tree._count += 1  # contamos el registro
+
+        cur = groups.head  # los grupos se consumen en orden (recorrido in-order)
+
+        def _build(n):  # arma un subárbol con los próximos n grupos
+            nonlocal cur
+            if n == 0:
+                return None
+            left = _build(n // 2)  # primero la mitad izquierda
+            key, records = cur.data  # el grupo del medio es la raíz del subárbol
+            cur = cur.next
+            node = AVLNode(key, None)
+            node.records = records  # reutilizamos la lista ya armada
+            node.left = left
+            node.right = _build(n - n // 2 - 1)  # y luego el resto a la derecha
+            tree.update_height(node)
+            return node
+
+        tree.root = _build(groups.size())
+        tree._keys = groups.size()  # un nodo por grupo
+        return tree
+
     def find(self, key):
         """Busca por clave exacta y devuelve la lista de registros (o lista vacía)."""
         node = self.root  # empezamos desde la raíz del árbol
@@ -254,37 +323,67 @@ class AVLTree:
 
         yield from _in(self.root)  # empezamos el recorrido desde la raíz
 
+    def range(self, lo, hi):
+        """Generador con los registros cuya clave está entre lo y hi (inclusive), en orden.
+
+        Solo baja por las ramas que pueden tener claves dentro del rango, así que
+        cuesta O(log n + k) en lugar de recorrer todo el árbol.
+        """
+        def _in(node):
+            if not node:  # si llegamos a un nodo vacío
+                return  # no hay nada que procesar aquí
+            if lo < node.key:  # a la izquierda solo puede haber claves del rango si esta es mayor que lo
+                yield from _in(node.left)
+            if lo <= node.key <= hi:  # la clave de este nodo está dentro del rango
+                for rec in node.records:
+                    yield rec
+            if node.key < hi:  # a la derecha solo si esta clave es menor que hi
+                yield from _in(node.right)
+
+        yield from _in(self.root)  # empezamos el recorrido desde la raíz
+
     def level_order(self):
-        """Generator por niveles que devuelve (key, records_list) para visualizacion.
+        """Generator por niveles que devuelve (depth, key, records_list) para visualizacion.
         
-        Recorre el árbol nivel por nivel, de izquierda a derecha.
+        Recorre el árbol nivel por nivel, de izquierda a derecha. depth es el nivel
+        del nodo (0 para la raíz), así quien lo usa no tiene que reconstruirlo.
         """
         if not self.root:  # si el árbol está vacío
             return  # no hay nada que mostrar
         # usar la Queue propia para evitar listas Python en estructuras núcleo
         q = Queue()  # creamos una cola para procesar nodos nivel por nivel
-        q.enqueue(self.root)  # metemos la raíz como primer elemento
+        q.enqueue((self.root, 0))  # metemos la raíz (nivel 0) como primer elemento
         while not q.is_empty():  # mientras tengamos nodos por procesar
-            node = q.dequeue()  # sacamos el siguiente nodo de la cola
-            yield (node.key, node.records)  # devolvemos la clave y todos sus registros
+            node, depth = q.dequeue()  # sacamos el siguiente nodo de la cola junto con su nivel
+            yield (depth, node.key, node.records)  # devolvemos el nivel, la clave y todos sus registros
             if node.left:  # si este nodo tiene hijo izquierdo
-                q.enqueue(node.left)  # lo metemos a la cola para procesarlo después
+                q.enqueue((node.left, depth + 1))  # lo metemos a la cola para procesarlo después
             if node.right:  # si este nodo tiene hijo derecho
-                q.enqueue(node.right)  # lo metemos a la cola para procesarlo después
+                q.enqueue((node.right, depth + 1))  # lo metemos a la cola para procesarlo después
 
     def size(self):
         return self._count  # devolvemos cuántos registros hemos guardado en total
 
+    def __len__(self):
+        return self._keys  # cantidad de claves distintas (nodos), sin recorrer el árbol
+
     def find_by_predicate(self, predicate):
         """Recorre el árbol y devuelve registros que cumplen predicate(record).
 
-        Se usa yield para no almacenar todo en memoria.
+        Se usa yield para no almacenar todo en memoria. El recorrido in-order es
+        iterativo, con la Stack propia guardando los nodos pendientes, así que no
+        crea un generador anidado por cada nodo visitado.
         """
-
-        def _in(node):  # función interna para recorrer el árbol
-            if not node:  # si llegamos a un nodo vacío
-                return  # no hay nada que hacer aquí
-            yield from _in(node.left)  # primero revisamos todos los hijos izquierdos
+        pending = Stack()  # nodos cuyo subárbol izquierdo aún estamos recorriendo
+        push, pop = pending.push, pending.pop  # métodos ligados una sola vez
+        node = self.root
+        while True:
+            while node:  # bajamos todo lo posible por la izquierda
+                push(node)
+                node = node.left
+            node = pop()  # el menor nodo que falta visitar
+            if node is None:  # pila vacía: ya visitamos todo el árbol
+                return
             # aplicamos predicate a cada registro almacenado en el nodo
             for rec in node.records:  # por cada registro en este nodo
                 try:
@@ -293,8 +392,4 @@ class AVLTree:
                 except Exception:
                     # si la predicate falla para un registro, la ignoramos
                     continue  # seguimos con el siguiente registro
-            yield from _in(node.right)  # después revisamos todos los hijos derechos
-
-        yield from _in(self.root)  # empezamos el recorrido desde la raíz
-
-
+            node = node.right  # después revisamos el subárbol derecho